@@ -0,0 +1,608 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import requests
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+try:
+    import numba  # kernel di normalizzazione (_norm_01_kernel)
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+try:
+    from tsdownsample import NaNMinMaxLTTBDownsampler
+    _DOWNSAMPLER = NaNMinMaxLTTBDownsampler()
+except ImportError:
+    _DOWNSAMPLER = None
+MAX_PLOT_POINTS = 2000  # punti per traccia: ordine di grandezza dei pixel del grafico
+
+PRESETS = {
+    "Ultime 6 ore": timedelta(hours=6),
+    "Ultime 12 ore": timedelta(hours=12),
+    "Ultime 24 ore": timedelta(hours=24),
+    "Ultimi 3 giorni": timedelta(days=3),
+    "Ultimi 7 giorni": timedelta(days=7),
+}
+RESAMPLE_OPTIONS = ["nessuna", "5min", "15min", "1H", "3H", "6H"]
+
+
+@dataclass(frozen=True)
+class DashboardConfig:
+    # Variabili mostrate di default (e nei KPI), se presenti nel CSV
+    default_vars: tuple = ()
+    # Fuso per la colonna 'ts' (None = resta in UTC)
+    display_tz: str | None = None
+    # Tab "Univariate" in sidebar oltre alle variabili che variano
+    show_univariate_tab: bool = False
+    # Se CSV_URL manca in secrets/env, chiedilo in sidebar
+    allow_url_fallback: bool = False
+    # Mostra l'URL della sorgente nel footer
+    show_source_url: bool = False
+    sidebar_caption: str = "Cache dati: TTL 60s. Usa 'Ricarica dati' per un reload forzato."
+
+
+# === CSV URL as hidden variable (secrets / env), with fallback UI ===
+def get_csv_url() -> str:
+    try:
+        return st.secrets["CSV_URL"]
+    except Exception:
+        return os.getenv("CSV_URL", "")
+
+
+# === Data loading with cache ===
+@st.cache_resource
+def _http_cache() -> dict:
+    # "entries": url -> {"etag", "last_modified", "path", "version", "size", "tail", "head", "header"}:
+    # validatori HTTP, Parquet dell'ultima versione scaricata e dati per le richieste Range.
+    # Condiviso tra sessioni e varianti: letture, aggiornamenti e cancellazioni sotto "lock"
+    return {"lock": threading.Lock(), "entries": {}}
+
+def _parquet_path(url: str, tag: str) -> str:
+    key = hashlib.sha1(f"{url}|{tag}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"tera_{key}.parquet")
+
+def parse_csv(content: bytes) -> pd.DataFrame:
+    try:
+        # Parser pyarrow: tokenizzazione multithread e timestamp ISO riconosciuti già in lettura
+        df = pd.read_csv(io.BytesIO(content), engine="pyarrow")
+    except ImportError:
+        df = pd.read_csv(io.BytesIO(content))
+
+    # Dati sensore a bassa precisione: float32 dimezza memoria e payload verso Plotly
+    num = df.select_dtypes('number').columns
+    df[num] = df[num].astype('float32')
+
+    df['ts'] = pd.to_datetime(df['ts'], format="ISO8601", utc=True, errors='coerce').dt.as_unit('ns')
+    df = df.dropna(subset=['ts']).sort_values('ts')
+    return df
+
+def _finalize(df: pd.DataFrame, display_tz: str | None) -> pd.DataFrame:
+    # Il Parquet resta in UTC ed è condiviso tra le varianti; il fuso entra nella versione
+    # perché le cache a valle restituiscono frame con 'ts' già convertito
+    if display_tz:
+        df['ts'] = df['ts'].dt.tz_convert(display_tz)
+    df.attrs["version"] = f"{df.attrs['version']}@{display_tz or 'UTC'}"
+    # df è ordinato per 'ts': estremi in O(1) invece di min()/max() a ogni rerun.
+    # Impostati dopo to_parquet, che serializza gli attrs in JSON (i Timestamp non lo sono)
+    if not df.empty:
+        df.attrs["ts_min"] = df['ts'].iloc[0]
+        df.attrs["ts_max"] = df['ts'].iloc[-1]
+    return df
+
+def _last_line(content: bytes) -> bytes:
+    # Ultima riga del CSV, con il suo "\n" finale
+    return content[content.rfind(b"\n", 0, len(content) - 1) + 1:]
+
+def _head_lines(content: bytes) -> bytes:
+    # Header + prima riga di dati: se cambiano il file è stato riscritto (es. log a finestra mobile)
+    end = content.find(b"\n", content.find(b"\n") + 1)
+    return content if end == -1 else content[:end + 1]
+
+def _range_start(resp: requests.Response) -> int | None:
+    # "Content-Range: bytes <inizio>-<fine>/<totale>"
+    unit, _, spec = resp.headers.get("Content-Range", "").partition(" ")
+    try:
+        return int(spec.split("-", 1)[0]) if unit == "bytes" else None
+    except ValueError:
+        return None
+
+def _conditional_headers(entry: dict) -> dict:
+    headers = {}
+    if entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    if entry["tail"].endswith(b"\n"):
+        # CSV in sola aggiunta: chiedi i byte nuovi ripartendo dall'ultima riga già letta, che deve ricomparire identica.
+        # Offset riferiti ai byte non compressi, quindi niente gzip su questa richiesta
+        headers["Range"] = f"bytes={entry['size'] - len(entry['tail'])}-"
+        headers["Accept-Encoding"] = "identity"
+    return headers
+
+def _append_rows(url: str, entry: dict, resp: requests.Response) -> pd.DataFrame | None:
+    # Append verificato: la risposta parte dall'offset chiesto, ripete byte per byte l'ultima riga già letta
+    # e l'inizio del file è invariato; altrimenti None (download completo)
+    chunk = resp.content
+    tail = entry["tail"]
+    if _range_start(resp) != entry["size"] - len(tail):
+        return None
+    if len(chunk) <= len(tail) or chunk[:len(tail)] != tail:
+        return None
+
+    head = entry["head"]
+    head_headers = {"Range": f"bytes=0-{len(head) - 1}", "Accept-Encoding": "identity"}
+    if resp.headers.get("ETag"):
+        head_headers["If-Match"] = resp.headers["ETag"]
+    head_resp = requests.get(url, headers=head_headers, timeout=30)
+    if head_resp.status_code != 206 or head_resp.content != head:
+        return None
+
+    try:
+        old = pd.read_parquet(entry["path"])
+    except FileNotFoundError:
+        return None
+    new = parse_csv(entry["header"] + chunk[len(tail):])
+    try:
+        new = new.astype(old.dtypes.to_dict())
+    except (ValueError, TypeError):
+        return None
+    df = pd.concat([old, new], ignore_index=True)
+    if not df['ts'].is_monotonic_increasing:
+        df = df.sort_values('ts')
+    return df
+
+def clear_http_cache() -> None:
+    # Dimentica validatori e Parquet: il prossimo load_data riscarica e riparsa l'intero CSV
+    cache = _http_cache()
+    with cache["lock"]:
+        for entry in cache["entries"].values():
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+        cache["entries"].clear()
+
+@st.cache_data(ttl=60)
+def load_data(url: str, display_tz: str | None = None) -> pd.DataFrame:
+    cache = _http_cache()
+    with cache["lock"]:
+        df = _fetch(url, cache["entries"])
+    return _finalize(df, display_tz)
+
+def _fetch(url: str, cache: dict) -> pd.DataFrame:
+    # GET condizionale: se il CSV non è cambiato (304) si rilegge il Parquet, senza riparsare il CSV;
+    # se è solo cresciuto (206) si parsano soltanto le righe aggiunte
+    entry = cache.get(url)
+    if entry is not None and not os.path.exists(entry["path"]):
+        entry = None
+
+    df = None
+    content = None  # CSV completo, se scaricato per intero
+    if entry is not None:
+        resp = requests.get(url, headers=_conditional_headers(entry), timeout=30)
+        if resp.status_code == 304:
+            try:
+                df = pd.read_parquet(entry["path"])
+            except FileNotFoundError:
+                pass  # Parquet sparito: come un cache miss, download completo
+            else:
+                df.attrs["version"] = entry["version"]
+                return df
+        if resp.status_code == 206:
+            df = _append_rows(url, entry, resp)
+        elif resp.status_code == 200:
+            content = resp.content
+
+    if df is None and content is None:
+        resp = requests.get(url, timeout=30)
+        resp.raise_for_status()
+        content = resp.content
+
+    if df is None:
+        df = parse_csv(content)
+        size = len(content)
+        tail = _last_line(content)
+        head = _head_lines(content)
+        header = content.split(b"\n", 1)[0] + b"\n"
+    else:
+        size = entry["size"] - len(entry["tail"]) + len(resp.content)
+        tail = _last_line(resp.content)
+        head = entry["head"]
+        header = entry["header"]
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    # Identifica la versione dei dati: chiave per le cache a valle (classificazione, resample, ...)
+    version = etag or last_modified or hashlib.sha1(resp.content).hexdigest()
+    df.attrs["version"] = version
+    if etag or last_modified:
+        path = _parquet_path(url, etag or last_modified)
+        df.to_parquet(path)
+        # Tieni solo l'ultima versione su disco
+        if entry is not None and entry["path"] != path:
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+        cache[url] = {"etag": etag, "last_modified": last_modified, "path": path, "version": version,
+                      "size": size, "tail": tail, "head": head, "header": header}
+    return df
+
+
+# === Time window ===
+def to_naive(dt_aware: pd.Timestamp) -> datetime:
+    # ritorna datetime naive riferito a UTC (per widget che chiedono naive)
+    return dt_aware.tz_convert('UTC').to_pydatetime().replace(tzinfo=None)
+
+def select_window(df: pd.DataFrame) -> tuple[datetime, datetime]:
+    min_ts_aware = df.attrs['ts_min'].tz_convert('UTC')
+    max_ts_aware = df.attrs['ts_max'].tz_convert('UTC')
+
+    col_a, col_b = st.columns([1, 2])
+    with col_a:
+        preset = st.selectbox(
+            "Seleziona intervallo",
+            options=list(PRESETS) + ["Personalizzato"],
+            index=2
+        )
+
+    with col_b:
+        max_naive = to_naive(max_ts_aware)
+        min_naive = to_naive(min_ts_aware)
+
+        if preset != "Personalizzato":
+            return max_naive - PRESETS[preset], max_naive
+
+        # default: ultime 24h
+        start_default = to_naive(max_ts_aware - pd.Timedelta(days=1))
+        end_default   = max_naive
+
+        use_calendar = st.toggle(
+            "Usa calendario + orario",
+            value=True,
+            help="Se disattivato, usa lo slider di intervallo."
+        )
+
+        if not use_calendar:
+            # --- SLIDER di datetimes ---
+            return st.slider(
+                "Intervallo personalizzato (UTC)",
+                min_value=min_naive,
+                max_value=max_naive,
+                value=(start_default, end_default),
+                step=timedelta(minutes=1),
+                format="YYYY-MM-DD HH:mm",
+            )
+
+        # --- DATE RANGE con gestione scalare/tupla ---
+        date_val = st.date_input(
+            "Intervallo date (UTC)",
+            value=(start_default.date(), end_default.date()),
+            min_value=min_naive.date(),
+            max_value=max_naive.date()
+        )
+
+        # Alcune versioni restituiscono una singola data se l'utente seleziona una sola giornata
+        if isinstance(date_val, tuple) or isinstance(date_val, list):
+            if len(date_val) == 2:
+                start_date, end_date = date_val
+            elif len(date_val) == 1:
+                start_date = end_date = date_val[0]
+            else:
+                start_date = end_date = end_default.date()
+        else:
+            # scalare
+            start_date = end_date = date_val
+
+        # --- ORARI ---
+        c1, c2 = st.columns(2)
+        with c1:
+            start_time = st.time_input(
+                "Ora inizio (UTC)",
+                value=start_default.time(),
+                step=timedelta(minutes=1)
+            )
+        with c2:
+            end_time = st.time_input(
+                "Ora fine (UTC)",
+                value=end_default.time(),
+                step=timedelta(minutes=1)
+            )
+
+        # Combina date + orari -> datetime naive (UTC), con clamp ai limiti disponibili
+        start = max(datetime.combine(start_date, start_time), min_naive)
+        end   = min(datetime.combine(end_date,   end_time),   max_naive)
+        return start, end
+
+def to_utc_ns(x: datetime) -> int:
+    # datetime naive dei widget (riferito a UTC) -> ns dall'epoch, stesso riferimento di 'ts'.array.asi8
+    return int(np.datetime64(x, 'ns').astype('i8'))
+
+def filter_window(df: pd.DataFrame, start_ns: int, end_ns: int) -> pd.DataFrame:
+    # df è ordinato per 'ts' (load_data), quindi basta una ricerca binaria sugli int64 + slice
+    ts_ns = df['ts'].array.asi8
+    lo = np.searchsorted(ts_ns, start_ns, side='left')
+    hi = np.searchsorted(ts_ns, end_ns, side='right')
+    dff = df.iloc[lo:hi]
+    if dff.empty:
+        st.warning("La finestra selezionata non contiene dati. Mostro l'ultimo record disponibile.")
+        dff = df.tail(1)
+    return dff
+
+
+# === Variables, resampling, normalization ===
+@st.cache_data(ttl=60)
+def classify_vars(_dff: pd.DataFrame, version: str, start_ns: int, end_ns: int,
+                  cols: tuple) -> tuple[list, list]:
+    # (univariate, non univariate) nella finestra; _dff non viene hashato, la chiave è versione dati + finestra
+    nun = _dff[list(cols)].nunique(dropna=True)
+    return nun[nun <= 1].index.tolist(), nun[nun > 1].index.tolist()
+
+def select_variables(config: DashboardConfig, uni_vars: list, nonuni_vars: list, default_vars: list) -> list:
+    defaults_nonuni = [c for c in default_vars if c in nonuni_vars] or nonuni_vars[:2]
+    if not config.show_univariate_tab:
+        st.markdown("### Variabili (non-univariate)")
+        if not nonuni_vars:
+            st.info("Nessuna variabile non univariata nella finestra selezionata. Allarga l'intervallo o attiva dispositivi.")
+        return st.multiselect("Seleziona variabili", options=nonuni_vars, default=defaults_nonuni)
+
+    st.markdown("### Variabili")
+    tab_nonuni, tab_uni = st.tabs(["Non univariate", "Univariate"])
+
+    with tab_nonuni:
+        nonuni_selected = st.multiselect(
+            "Seleziona variabili che VARIANO",
+            options=nonuni_vars,
+            default=defaults_nonuni,
+            key="ms_nonuni"
+        )
+
+    with tab_uni:
+        uni_selected = st.multiselect(
+            "Seleziona variabili COSTANTI",
+            options=uni_vars,
+            default=[],
+            key="ms_uni"
+        )
+
+    # Unisci selezioni
+    return list(dict.fromkeys((nonuni_selected or []) + (uni_selected or [])))
+
+@st.cache_data(ttl=60)
+def resample_window(_dff: pd.DataFrame, version: str, start_ns: int, end_ns: int,
+                    rule: str) -> pd.DataFrame:
+    # Chiave: versione dati + finestra + regola; cambiare punti/normalizzazione/variabili non ricalcola
+    return _dff.set_index('ts').resample(rule).mean(numeric_only=True).reset_index()
+
+@st.cache_resource
+def _warm_numba() -> None:
+    # Compila il kernel una volta per processo, così la prima normalizzazione non paga la latenza JIT
+    if HAS_NUMBA:
+        # Due layout: con più colonne l'array è Fortran, con una sola è anche C-contiguo e numba lo tipizza come C
+        _norm_01_kernel(np.zeros((4, 2), dtype=np.float32, order="F"))
+        _norm_01_kernel(np.zeros((4, 1), dtype=np.float32, order="F"))
+
+if HAS_NUMBA:
+    @numba.njit(parallel=True, cache=True)
+    def _norm_01_kernel(a):
+        # a: (N, k) float32 in ordine Fortran (layout C se k == 1), scalata in place colonna per colonna.
+        # Niente fastmath: i NaN (bin vuoti del resample) vanno esclusi da min/max
+        n, k = a.shape
+        for j in numba.prange(k):
+            mn = np.inf
+            mx = -np.inf
+            for i in range(n):
+                v = a[i, j]
+                if v < mn:
+                    mn = v
+                if v > mx:
+                    mx = v
+            rng = mx - mn
+            if not rng > 0:
+                rng = 1.0
+            for i in range(n):
+                a[i, j] = (a[i, j] - mn) / rng
+
+def normalize_01(plot_df: pd.DataFrame, cols: list) -> None:
+    norm_cols = [c for c in cols if c in plot_df.columns]
+    if HAS_NUMBA:
+        # Un solo passaggio parallelo (min/max + scala) per colonna
+        a = np.asfortranarray(plot_df[norm_cols].to_numpy(dtype=np.float32))
+        _norm_01_kernel(a)
+        plot_df.loc[:, norm_cols] = a
+        return
+    sub = plot_df[norm_cols]
+    mn = sub.min()
+    rng = sub.max() - mn
+    # Colonne a range nullo: divisore 1 (niente divisione per zero, nessun ramo per colonna)
+    plot_df.loc[:, norm_cols] = ((sub - mn) / rng.where(rng != 0, 1)).to_numpy()
+
+
+# === Charts ===
+def downsample_for_plot(plot_df: pd.DataFrame, cols: list, n_out: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    # MinMaxLTTB lato server: per ogni colonna al più n_out punti, righe = unione degli indici scelti
+    if _DOWNSAMPLER is None or len(plot_df) <= n_out:
+        return plot_df
+    x = plot_df['ts'].array.asi8
+    idx = np.unique(np.concatenate([
+        _DOWNSAMPLER.downsample(x, np.ascontiguousarray(plot_df[c].to_numpy()), n_out=n_out) for c in cols
+    ]))
+    return plot_df.iloc[idx]
+
+def _plot_frame(dff: pd.DataFrame, cols: list, normalize: bool) -> pd.DataFrame:
+    # Solo 'ts' + colonne del grafico: la normalizzazione copia k colonne, non l'intero frame
+    if not normalize:
+        return dff
+    plot_df = dff[['ts', *cols]].copy()
+    normalize_01(plot_df, cols)
+    return plot_df
+
+@st.cache_resource(ttl=60, max_entries=64)
+def line_chart_figure(_dff: pd.DataFrame, frame_key: tuple, cols: tuple, show_points: bool,
+                      normalize: bool) -> go.Figure:
+    # frame_key = (versione dati, finestra, resample) identifica _dff, che non viene hashato.
+    # cache_resource: si riusa lo stesso oggetto Figure (mai modificato dopo la costruzione),
+    # che st.plotly_chart serializza con to_dict() senza rivalidarlo; un dict passerebbe da Figure(**dict)
+    plot_df = _plot_frame(_dff, list(cols), normalize)
+    fig = px.line(downsample_for_plot(plot_df, list(cols)), x="ts", y=list(cols), markers=show_points,
+                  render_mode="webgl")
+    fig.update_layout(legend=dict(orientation="h", y=-0.2), margin=dict(l=10, r=10, t=30, b=10), height=500)
+    return fig
+
+@st.cache_resource(ttl=60, max_entries=64)
+def variable_chart_figure(_dff: pd.DataFrame, frame_key: tuple, v: str, show_points: bool,
+                          normalize: bool) -> go.Figure:
+    plot_df = _plot_frame(_dff, [v], normalize)
+    fig_v = px.line(downsample_for_plot(plot_df, [v]), x="ts", y=v, markers=show_points, title=v,
+                    render_mode="webgl")
+    fig_v.update_layout(margin=dict(l=10, r=10, t=30, b=10), height=280)
+    return fig_v
+
+@st.fragment
+def render_charts(dff: pd.DataFrame, frame_key: tuple, vars_selected: list) -> None:
+    # Fragment: i controlli di sola visualizzazione rieseguono solo questo blocco,
+    # senza ripassare da caricamento, filtro e resample
+    st.subheader("Grafico interattivo")
+    c1, c2 = st.columns(2)
+    with c1:
+        show_points = st.checkbox("Mostra punti", value=False)
+    with c2:
+        normalize = st.checkbox("Normalizza (0–1)", value=False, help="Scala ciascuna variabile su [0,1]")
+
+    if not vars_selected:
+        st.info("Seleziona almeno una variabile in sidebar.")
+        return
+
+    # Figure in cache: a parità di parametri niente normalizzazione, downsampling, px.line né validazione
+    fig = line_chart_figure(dff, frame_key, tuple(vars_selected), show_points, normalize)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Toggle al posto dell'expander: il corpo di un expander chiuso viene comunque eseguito
+    if st.toggle("Vedi grafici separati per variabile", value=False, key="show_separate"):
+        for v in vars_selected:
+            if v in dff.columns:
+                fig_v = variable_chart_figure(dff, frame_key, v, show_points, normalize)
+                st.plotly_chart(fig_v, use_container_width=True)
+
+
+# === KPIs ===
+def render_kpis(dff: pd.DataFrame, default_vars: list) -> None:
+    st.subheader("Indicatori rapidi")
+    kcols = st.columns(4)
+    # Ultima riga materializzata una volta sola, dtypes letti una volta sola
+    last_row = dff.iloc[-1].to_dict()
+    dtypes = dff.dtypes
+
+    for i, v in enumerate([c for c in default_vars if c in last_row][:4]):
+        if pd.api.types.is_numeric_dtype(dtypes[v]):
+            with kcols[i]:
+                st.metric(v, f"{last_row[v]:.2f}")
+
+
+# === Data table & download ===
+@st.cache_data(ttl=60)
+def to_csv_bytes(_dff: pd.DataFrame, version: str, start_ns: int, end_ns: int,
+                 rule: str) -> bytes:
+    # Serializzazione CSV solo al cambio di dati/finestra/aggregazione, non a ogni rerun
+    return _dff.to_csv(index=False).encode('utf-8')
+
+
+# === Page ===
+def render(config: DashboardConfig) -> None:
+    st.set_page_config(page_title="Tera Monitor", page_icon="📈", layout="wide")
+
+    csv_url = get_csv_url()
+
+    st.sidebar.title("⚙️ Controlli")
+    st.sidebar.caption(config.sidebar_caption)
+
+    if not csv_url:
+        if not config.allow_url_fallback:
+            st.error("CSV_URL non configurato nei secrets/env.")
+            st.stop()
+        # Fallback: se URL non presente nei secrets/env, consenti inserimento manuale
+        csv_url = st.sidebar.text_input(
+            "URL CSV (fallback)", value="", type="password",
+            help="Usa questa casella solo se non hai configurato CSV_URL nei secrets o come variabile d'ambiente."
+        )
+        if not csv_url:
+            st.warning("Configura CSV_URL nei secrets/env oppure inserisci l'URL nella sidebar per procedere.")
+            st.stop()
+
+    # === Reload button ===
+    if st.sidebar.button("🔄 Ricarica dati (svuota cache)"):
+        load_data.clear()
+        clear_http_cache()
+        st.rerun()
+
+    df = load_data(csv_url, config.display_tz)
+
+    # load_data scarta già le righe con 'ts' non valido: basta controllare che resti qualcosa
+    if df.empty:
+        st.error("CSV vuoto o colonna 'ts' non valida.")
+        st.stop()
+    version = df.attrs["version"]
+
+    # === Column sets ===
+    num_cols = [c for c in df.columns if c != 'ts' and pd.api.types.is_numeric_dtype(df[c])]
+    default_vars = [c for c in config.default_vars if c in num_cols] or num_cols[:2]
+
+    st.title("📊 Tera – Dashboard interattiva")
+
+    # === Time window selection ===
+    st.subheader("Finestra temporale")
+    start, end = select_window(df)
+
+    # Validazione range
+    if start > end:
+        st.error("Intervallo non valido: l'inizio è successivo alla fine.")
+        st.stop()
+
+    start_ns = to_utc_ns(start)
+    end_ns = to_utc_ns(end)
+    dff = filter_window(df, start_ns, end_ns)
+
+    # === Sidebar: variables and options ===
+    with st.sidebar:
+        st.markdown("---")
+        # Classificazione rispetto alla finestra selezionata
+        numeric_in_window = tuple(c for c in num_cols if c in dff.columns)
+        uni_vars, nonuni_vars = classify_vars(dff, version, start_ns, end_ns, numeric_in_window)
+        vars_selected = select_variables(config, uni_vars, nonuni_vars, default_vars)
+
+        resample = st.selectbox(
+            "Aggregazione (resample)",
+            options=RESAMPLE_OPTIONS,
+            index=0,
+            help="Media su intervalli per serie più leggibili."
+        )
+
+    # Resampling (dopo selezione)
+    if resample != "nessuna" and not dff.empty:
+        dff = resample_window(dff, version, start_ns, end_ns, resample)
+
+    _warm_numba()
+    render_charts(dff, (version, start_ns, end_ns, resample), vars_selected)
+    render_kpis(dff, default_vars)
+
+    with st.expander("Dati filtrati"):
+        cols_to_show = ['ts'] + [c for c in (vars_selected or []) if c in dff.columns]
+        if cols_to_show == ['ts']:
+            cols_to_show = ['ts'] + [c for c in num_cols if c in dff.columns][:5]  # fallback
+        st.dataframe(dff[cols_to_show], hide_index=True, use_container_width=True)
+        csv = to_csv_bytes(dff, version, start_ns, end_ns, resample)
+        st.download_button("Scarica CSV filtrato", data=csv, file_name="tera_filtrato.csv", mime="text/csv")
+
+    # === Footer ===
+    if config.show_source_url:
+        st.caption("Fonte dati: " + csv_url)
+    else:
+        st.caption("Fonte dati: URL fornito via secrets/env (non esposto nel codice).")